@@ -29,6 +29,7 @@ from pathlib import Path
 from shutil import rmtree
 from tempfile import mkdtemp
 from textwrap import dedent
+from typing import Dict
 from typing import List
 from typing import Set
 
@@ -40,6 +41,7 @@ from test_helpers import parse_solc_version
 from test_helpers import replace_version_pragmas
 from test_helpers import settings_from_preset
 from test_helpers import SettingsPreset
+from test_helpers import unfrozen_settings
 
 CURRENT_EVM_VERSION: str = "shanghai"
 
@@ -62,14 +64,17 @@ class BaseRunner(metaclass=ABCMeta):
     solc_binary_type: str
     solc_binary_path: Path
     presets: Set[SettingsPreset]
+    # Variables that override the inherited environment of the processes started by the runner
+    env: Dict[str, str]
 
     def __init__(self, argv, config: TestConfig):
         args = parse_command_line(f"{config.name} external tests", argv)
         self.config = config
         self.solc_binary_type = args.solc_binary_type
-        self.solc_binary_path = args.solc_binary_path
+        # Resolve the path before the runner changes the working directory
+        self.solc_binary_path = args.solc_binary_path.resolve()
         self.presets = parse_custom_presets(args.selected_presets) if args.selected_presets else config.selected_presets()
-        self.env = os.environ.copy()
+        self.env = {}
         self.tmp_dir = mkdtemp(prefix=f"ext-test-{config.name}-")
         self.test_dir = Path(self.tmp_dir) / "ext"
 
@@ -154,7 +159,7 @@ def run_test(runner: BaseRunner):
         print(dedent(f"""\
             -------------------------------------
             Settings preset: {preset.value}
-            Settings: {settings}
+            Settings: {unfrozen_settings(settings)}
             EVM version: {runner.config.evm_version}
             Compiler version: {get_solc_short_version(solc_version)}
             Compiler version (full): {solc_version}
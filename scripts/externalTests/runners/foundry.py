@@ -19,21 +19,49 @@
 # (c) 2023 solidity contributors.
 # ------------------------------------------------------------------------------
 
+import json
 import os
 import re
 import subprocess
+from functools import cached_property
+from pathlib import Path
 from shutil import which
-from textwrap import dedent
+from typing import List
 from typing import Optional
 
 from runners.base import BaseRunner
 from test_helpers import SettingsPreset
 from test_helpers import settings_from_preset
 
-def run_forge_command(command: str, env: Optional[dict] = None):
+PROFILE_NAME_REGEX = re.compile(r"[-+]+")
+
+def toml_value(value) -> str:
+    """Returns the TOML representation of a boolean, string or list value"""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, str):
+        # With ensure_ascii=False JSON escapes only quotes, backslashes and control characters below
+        # U+0020, which TOML basic strings accept too. TOML also requires U+007F to be escaped.
+        # Other characters are written as raw UTF-8 because JSON would escape those outside of
+        # the BMP as surrogate pairs, which are not valid in TOML.
+        return json.dumps(value, ensure_ascii=False).replace("\x7f", "\\u007f")
+    if isinstance(value, list):
+        return f"[{', '.join(toml_value(item) for item in value)}]"
+    raise TypeError(f"Unsupported TOML value: {value!r}")
+
+def run_forge_command(args: List[str], env_overrides: Optional[dict] = None):
+    # subprocess uses posix_spawn() instead of fork() + exec() only when the executable is given
+    # as a path and close_fds is disabled. Our descriptors are non-inheritable anyway.
+    executable = which(args[0])
+    if executable is None:
+        raise RuntimeError(f"{args[0]} not found.")
+
+    # Let the child inherit the environment unless some of the variables need to be overridden
     subprocess.run(
-        command.split(),
-        env=env if env is not None else os.environ.copy(),
+        args,
+        executable=executable,
+        env={**os.environ, **env_overrides} if env_overrides else None,
+        close_fds=False,
         check=True
     )
 
@@ -43,6 +71,10 @@ class FoundryRunner(BaseRunner):
 
     FOUNDRY_CONFIG_FILE = "foundry.toml"
 
+    @cached_property
+    def config_file_path(self) -> Path:
+        return self.test_dir / self.FOUNDRY_CONFIG_FILE
+
     def setup_environment(self):
         super().setup_environment()
         if which("forge") is None:
@@ -52,62 +84,59 @@ class FoundryRunner(BaseRunner):
     def profile_name(preset: SettingsPreset):
         """Returns foundry profile name"""
         # Replace - or + by underscore to avoid invalid toml syntax
-        return re.sub(r"(\-|\+)+", "_", preset.value)
+        return PROFILE_NAME_REGEX.sub("_", preset.value)
 
     @staticmethod
-    def profile_section(profile_fields: dict) -> str:
-        return dedent("""\
-            [profile.{name}]
-            gas_reports = ["*"]
-            auto_detect_solc = false
-            solc = "{solc}"
-            evm_version = "{evm_version}"
-            optimizer = {optimizer}
-            via_ir = {via_ir}
-
-            [profile.{name}.optimizer_details]
-            yul = {yul}
-        """).format(**profile_fields)
+    def profile_section(name: str, profile: dict) -> str:
+        """Returns the TOML section of a foundry profile. Nested dicts become its subtables."""
+        keys = [f"{key} = {toml_value(value)}\n" for key, value in profile.items() if not isinstance(value, dict)]
+        subtables = [
+            f"\n[profile.{name}.{key}]\n" + "".join(f"{k} = {toml_value(v)}\n" for k, v in value.items())
+            for key, value in profile.items()
+            if isinstance(value, dict)
+        ]
+        return f"[profile.{name}]\n" + "".join(keys) + "".join(subtables)
 
     def setup_presets_profiles(self):
         """Configure forge tests profiles"""
 
+        solc_path = os.fspath(self.solc_binary_path)
         profiles = []
         for preset in self.presets:
             settings = settings_from_preset(preset, self.config.evm_version)
-            profiles.append(self.profile_section({
-                "name": self.profile_name(preset),
-                "solc": self.solc_binary_path,
+            profiles.append(self.profile_section(self.profile_name(preset), {
+                "gas_reports": ["*"],
+                "auto_detect_solc": False,
+                "solc": solc_path,
                 "evm_version": self.config.evm_version,
-                "optimizer": str(settings["optimizer"]["enabled"]).lower(),
-                "via_ir": str(settings["viaIR"]).lower(),
-                "yul": str(settings["optimizer"]["details"]["yul"]).lower(),
+                "optimizer": settings["optimizer"]["enabled"],
+                "via_ir": settings["viaIR"],
+                "optimizer_details": {"yul": settings["optimizer"]["details"]["yul"]},
             }))
 
         with open(
-            file=self.test_dir / self.FOUNDRY_CONFIG_FILE,
+            file=self.config_file_path,
             mode="a",
             encoding="utf-8",
         ) as f:
-            for profile in profiles:
-                f.write(profile)
+            f.write("".join(profiles))
 
     @BaseRunner.enter_test_dir
     def configure(self):
         """Install project dependencies"""
         self.setup_presets_profiles()
-        run_forge_command("forge install", self.env)
+        run_forge_command(["forge", "install"], self.env)
 
     @BaseRunner.enter_test_dir
     def compile(self, preset: SettingsPreset):
         """Compile project"""
 
         # Set the Foundry profile environment variable
-        self.env.update({"FOUNDRY_PROFILE": self.profile_name(preset)})
-        run_forge_command("forge build", self.env)
+        self.env["FOUNDRY_PROFILE"] = self.profile_name(preset)
+        run_forge_command(["forge", "build"], self.env)
 
     @BaseRunner.enter_test_dir
     def run_test(self):
         """Run project tests"""
 
-        run_forge_command("forge test --gas-report", self.env)
+        run_forge_command(["forge", "test", "--gas-report"], self.env)
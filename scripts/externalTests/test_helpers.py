@@ -25,8 +25,11 @@ import subprocess
 import sys
 from argparse import ArgumentParser
 from enum import Enum
+from functools import lru_cache
 from pathlib import Path
+from types import MappingProxyType
 from typing import List
+from typing import Mapping
 from typing import Set
 
 # Our scripts/ is not a proper Python package so we need to modify PYTHONPATH to import from it
@@ -57,15 +60,36 @@ def compiler_settings(evm_version: str, via_ir: bool = False, optimizer: bool =
     }
 
 
-def settings_from_preset(preset: SettingsPreset, evm_version: str) -> dict:
+PRESET_COMPILER_OPTIONS = {
+    SettingsPreset.LEGACY_NO_OPTIMIZE:       {},
+    SettingsPreset.IR_NO_OPTIMIZE:           {"via_ir": True},
+    SettingsPreset.LEGACY_OPTIMIZE_EVM_ONLY: {"optimizer": True},
+    SettingsPreset.IR_OPTIMIZE_EVM_ONLY:     {"via_ir": True, "optimizer": True},
+    SettingsPreset.LEGACY_OPTIMIZE_EVM_YUL:  {"optimizer": True, "yul": True},
+    SettingsPreset.IR_OPTIMIZE_EVM_YUL:      {"via_ir": True, "optimizer": True, "yul": True},
+}
+
+
+def frozen_settings(settings: Mapping) -> MappingProxyType:
+    """Returns a read-only view of the settings, including all the nested mappings"""
+    return MappingProxyType({
+        key: frozen_settings(value) if isinstance(value, Mapping) else value
+        for key, value in settings.items()
+    })
+
+
+def unfrozen_settings(settings: Mapping) -> dict:
+    """Returns a mutable deep copy of the settings"""
     return {
-        SettingsPreset.LEGACY_NO_OPTIMIZE:       compiler_settings(evm_version),
-        SettingsPreset.IR_NO_OPTIMIZE:           compiler_settings(evm_version, via_ir=True),
-        SettingsPreset.LEGACY_OPTIMIZE_EVM_ONLY: compiler_settings(evm_version, optimizer=True),
-        SettingsPreset.IR_OPTIMIZE_EVM_ONLY:     compiler_settings(evm_version, via_ir=True, optimizer=True),
-        SettingsPreset.LEGACY_OPTIMIZE_EVM_YUL:  compiler_settings(evm_version, optimizer=True, yul=True),
-        SettingsPreset.IR_OPTIMIZE_EVM_YUL:      compiler_settings(evm_version, via_ir=True, optimizer=True, yul=True),
-    }[preset]
+        key: unfrozen_settings(value) if isinstance(value, Mapping) else value
+        for key, value in settings.items()
+    }
+
+
+@lru_cache(maxsize=None)
+def settings_from_preset(preset: SettingsPreset, evm_version: str) -> MappingProxyType:
+    # The same settings object is shared by all callers so it is read-only all the way down.
+    return frozen_settings(compiler_settings(evm_version, **PRESET_COMPILER_OPTIONS[preset]))
 
 
 def parse_custom_presets(presets: List[str]) -> Set[SettingsPreset]:
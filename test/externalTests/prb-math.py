@@ -19,6 +19,7 @@
 # (c) 2023 solidity contributors.
 # ------------------------------------------------------------------------------
 
+import os
 import sys
 import subprocess
 from pathlib import Path
@@ -44,7 +45,7 @@ class PRBMathRunner(FoundryRunner):
         # has transitioned from Foundry to Node.js.
         subprocess.run(
             ["pnpm", "install"],
-            env=self.env,
+            env={**os.environ, **self.env},
             check=True
         )
 
@@ -20,10 +20,16 @@
 # ------------------------------------------------------------------------------
 
 from argparse import ArgumentParser, Namespace
+from collections import deque
+from dataclasses import dataclass
+from functools import lru_cache
 import os
 from pathlib import Path
+import selectors
 import sys
 import subprocess
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional, TextIO
 
 EXTERNAL_TESTS_DIR = Path(__file__).parent / "externalTests"
 
@@ -32,37 +38,138 @@ class ExternalTestNotFound(Exception):
     pass
 
 
-def detect_external_tests() -> dict:
-    return {
-        file_path.stem: file_path
-        for file_path in Path(EXTERNAL_TESTS_DIR).iterdir()
-        if file_path.is_file() and file_path.suffix in (".sh", ".py")
-    }
+@lru_cache(maxsize=1)
+def detect_external_tests() -> MappingProxyType:
+    # The result is cached so it is returned as a read-only view to keep callers from modifying it.
+    with os.scandir(EXTERNAL_TESTS_DIR) as entries:
+        return MappingProxyType({
+            os.path.splitext(entry.name)[0]: Path(entry.path)
+            for entry in entries
+            if entry.name.endswith((".sh", ".py")) and entry.is_file(follow_symlinks=False)
+        })
 
 
-def display_available_external_tests(_):
+def display_available_external_tests(_: Optional[Namespace]):
     print("Available external tests:")
     print(*detect_external_tests().keys())
 
 
-def run_test_scripts(solc_binary_type: str, solc_binary_path: Path, tests: dict):
-    for test_name, test_script_path in tests.items():
-        print(f"Running {test_name} external test...")
-        subprocess.run(
-            [test_script_path, solc_binary_type, solc_binary_path],
-            check=True
-        )
+@dataclass
+class TestOutputPipe:
+    test_name: str
+    process: subprocess.Popen
+    output: TextIO
+    buffer: bytes = b""
+
+    def write(self, data: bytes):
+        """Print complete lines prefixed with the test name and keep the incomplete tail buffered"""
+        *lines, self.buffer = (self.buffer + data).split(b"\n")
+        for line in lines:
+            self.print_line(line)
+
+    def flush(self):
+        if self.buffer != b"":
+            self.print_line(self.buffer)
+            self.buffer = b""
+
+    def print_line(self, line: bytes):
+        print(f"[{self.test_name}] {line.decode('utf-8', errors='replace')}", file=self.output, flush=True)
+
+
+def spawn_test_script(
+    solc_binary_type: str,
+    solc_binary_path: Path,
+    test_script_path: Path,
+    capture_output: bool = False
+) -> subprocess.Popen:
+    command = [test_script_path, solc_binary_type, solc_binary_path]
+    if test_script_path.suffix == ".py":
+        # Run Python runners with the current interpreter instead of going through the env shebang.
+        command.insert(0, sys.executable)
+    return subprocess.Popen(
+        command,
+        stdout=subprocess.PIPE if capture_output else None,
+        stderr=subprocess.PIPE if capture_output else None,
+        bufsize=0,
+        # Lets subprocess use posix_spawn(). Pipes of other running tests are not inherited either way.
+        close_fds=False,
+    )
+
+
+def run_test_scripts(solc_binary_type: str, solc_binary_path: Path, tests: Mapping[str, Path], jobs: int = 1):
+    jobs = min(jobs, len(tests))
+    if jobs <= 1:
+        for test_name, test_script_path in tests.items():
+            print(f"Running {test_name} external test...", flush=True)
+            with spawn_test_script(solc_binary_type, solc_binary_path, test_script_path) as process:
+                try:
+                    process.wait()
+                finally:
+                    # Do not leave the test running if we are interrupted while waiting for it.
+                    if process.poll() is None:
+                        process.kill()
+                        process.wait()
+            if process.returncode != 0:
+                raise subprocess.CalledProcessError(process.returncode, process.args)
+        return
+
+    # Output of all the tests running concurrently is drained through a single selector and printed
+    # line by line, prefixed with the test name, so that the logs stay readable while tests are running.
+    pending_tests = deque(tests.items())
+    open_pipes: Dict[subprocess.Popen, int] = {}
+    failed_process: Optional[subprocess.Popen] = None
+    with selectors.DefaultSelector() as selector:
+        try:
+            while len(pending_tests) > 0 or len(open_pipes) > 0:
+                while len(pending_tests) > 0 and len(open_pipes) < jobs:
+                    test_name, test_script_path = pending_tests.popleft()
+                    print(f"Running {test_name} external test...", flush=True)
+                    process = spawn_test_script(solc_binary_type, solc_binary_path, test_script_path, capture_output=True)
+                    open_pipes[process] = 2
+                    for pipe, output in ((process.stdout, sys.stdout), (process.stderr, sys.stderr)):
+                        os.set_blocking(pipe.fileno(), False)
+                        selector.register(pipe, selectors.EVENT_READ, TestOutputPipe(test_name, process, output))
+
+                for key, _ in selector.select():
+                    output_pipe = key.data
+                    data = os.read(key.fd, 65536)
+                    if data != b"":
+                        output_pipe.write(data)
+                        continue
+
+                    output_pipe.flush()
+                    selector.unregister(key.fileobj)
+                    key.fileobj.close()
+                    open_pipes[output_pipe.process] -= 1
+                    if open_pipes[output_pipe.process] == 0:
+                        output_pipe.process.wait()
+                        del open_pipes[output_pipe.process]
+                        if output_pipe.process.returncode != 0 and failed_process is None:
+                            # Let the tests that are already running finish but do not start new ones.
+                            failed_process = output_pipe.process
+                            pending_tests.clear()
+        finally:
+            # Only reached with open pipes if something went wrong, e.g. an interrupt or a failure
+            # to start a test. Do not leave the tests that are still running orphaned.
+            for running_process in open_pipes:
+                running_process.kill()
+                running_process.wait()
+                running_process.stdout.close()
+                running_process.stderr.close()
+
+    if failed_process is not None:
+        raise subprocess.CalledProcessError(failed_process.returncode, failed_process.args)
 
 
-def run_external_tests(args: dict):
-    solc_binary_type = args["solc_binary_type"]
-    solc_binary_path = args["solc_binary_path"]
+def run_external_tests(args: Namespace):
+    solc_binary_type = args.solc_binary_type
+    solc_binary_path = args.solc_binary_path
 
     all_test_scripts = detect_external_tests()
-    selected_tests = args["selected_tests"]
-    if args["run_all"]:
+    selected_tests = args.selected_tests
+    if args.run_all:
         assert len(selected_tests) == 0
-        run_test_scripts(solc_binary_type, solc_binary_path, all_test_scripts)
+        run_test_scripts(solc_binary_type, solc_binary_path, all_test_scripts, args.jobs)
         return
 
     if len(selected_tests) == 0:
@@ -70,8 +177,8 @@ def run_external_tests(args: dict):
             "External test was not selected. Please use --run or --run-all option"
         )
 
-    unrecognized_tests = set(selected_tests) - set(all_test_scripts.keys())
-    if unrecognized_tests != set():
+    unrecognized_tests = [test for test in selected_tests if test not in all_test_scripts]
+    if len(unrecognized_tests) > 0:
         raise ExternalTestNotFound(
             f"External test(s) not found: {', '.join(unrecognized_tests)}"
         )
@@ -79,6 +186,7 @@ def run_external_tests(args: dict):
         solc_binary_type,
         solc_binary_path,
         {k: all_test_scripts[k] for k in selected_tests},
+        args.jobs,
     )
 
 
@@ -114,6 +222,13 @@ def parse_commandline() -> Namespace:
         required=True,
         help="Path to the solidity compiler binary.",
     )
+    run_command.add_argument(
+        "--jobs",
+        dest="jobs",
+        type=int,
+        default=max((os.cpu_count() or 1) - 2, 1),
+        help="Maximum number of external tests to run in parallel.",
+    )
 
     running_mode = run_command.add_mutually_exclusive_group()
     running_mode.add_argument(
@@ -136,9 +251,14 @@ def parse_commandline() -> Namespace:
 
 
 def main():
+    # The list command takes no arguments so there is no need to build the whole parser for it
+    if sys.argv[1:] == ["list"]:
+        display_available_external_tests(None)
+        return os.EX_OK
+
     try:
         args = parse_commandline()
-        args.cmd(vars(args))
+        args.cmd(args)
         return os.EX_OK
     except ExternalTestNotFound as exception:
         print(f"Error: {exception}", file=sys.stderr)
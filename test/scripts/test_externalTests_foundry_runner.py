@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+
+from pathlib import Path
+from textwrap import dedent
+import sys
+import unittest
+
+# NOTE: Modules in scripts/externalTests/runners/ import their siblings as top-level modules
+# so scripts/externalTests/ has to be in PYTHONPATH as well.
+sys.path.insert(0, str(Path(__file__).parents[2] / 'scripts' / 'externalTests'))
+
+# pragma pylint: disable=import-error,wrong-import-position
+from runners.foundry import FoundryRunner, toml_value
+# pragma pylint: enable=import-error,wrong-import-position
+
+
+class TestTomlValue(unittest.TestCase):
+    def test_bool(self):
+        self.assertEqual(toml_value(True), 'true')
+        self.assertEqual(toml_value(False), 'false')
+
+    def test_list(self):
+        self.assertEqual(toml_value(['*', 'a b']), '["*", "a b"]')
+        self.assertEqual(toml_value([]), '[]')
+
+    def test_string_with_quotes_and_backslashes(self):
+        self.assertEqual(toml_value('C:\\path "with" quotes\\'), '"C:\\\\path \\"with\\" quotes\\\\"')
+
+    def test_string_with_control_characters(self):
+        self.assertEqual(toml_value('a\tb\nc\x01d\x7fe'), '"a\\tb\\nc\\u0001d\\u007fe"')
+
+    def test_string_with_non_bmp_character(self):
+        # Must not be escaped as a surrogate pair, which is not a valid TOML escape
+        self.assertEqual(toml_value('/tmp/\U0001F600/solc'), '"/tmp/\U0001F600/solc"')
+
+    def test_unsupported_type(self):
+        with self.assertRaises(TypeError):
+            toml_value(1)
+
+
+class TestProfileSection(unittest.TestCase):
+    def test_profile_section(self):
+        profile = {
+            'gas_reports': ['*'],
+            'auto_detect_solc': False,
+            'solc': '/path with "quotes"/solc',
+            'evm_version': 'shanghai',
+            'optimizer': True,
+            'via_ir': False,
+            'optimizer_details': {'yul': True},
+        }
+        expected_section = dedent("""\
+            [profile.legacy_optimize_evm_yul]
+            gas_reports = ["*"]
+            auto_detect_solc = false
+            solc = "/path with \\"quotes\\"/solc"
+            evm_version = "shanghai"
+            optimizer = true
+            via_ir = false
+
+            [profile.legacy_optimize_evm_yul.optimizer_details]
+            yul = true
+        """)
+
+        self.assertEqual(FoundryRunner.profile_section('legacy_optimize_evm_yul', profile), expected_section)